@@ -1,14 +1,26 @@
+import asyncio
+import json
+import os
 import random
 import re
 import time
-import xml.etree.ElementTree as ET
-from urllib.parse import parse_qs, urlparse
-from xml.dom import minidom
-
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from urllib.parse import unquote
+from zoneinfo import ZoneInfo
+
+import aiohttp
+import lxml.etree as LET
+import lxml.html
 from loguru import logger
+from lxml.cssselect import CSSSelector
 from selenium.common.exceptions import (
-    StaleElementReferenceException,
     TimeoutException,
+    WebDriverException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
@@ -26,57 +38,302 @@ class LocatorAvito:
     PRICE = (By.CSS_SELECTOR, "[itemprop='price']")
     GEO = (By.CSS_SELECTOR, "div[class*='style-item-address']")
     DATE_PUBLIC = (By.CSS_SELECTOR, "[data-marker='item-view/item-date']")
+    NO_RESULTS = (
+        By.CSS_SELECTOR,
+        "[data-marker*='no-results'], [data-marker*='serp-empty']",
+    )
+
+
+# Селекторы детальной страницы для lxml, компилируются один раз при импорте
+_DATE_PUBLIC_SELECTOR = CSSSelector(
+    LocatorAvito.DATE_PUBLIC[1], translator='html'
+)
+_GEO_SELECTOR = CSSSelector(LocatorAvito.GEO[1], translator='html')
+
+# User-Agent к ним добавляется из браузера, см. AvitoParse.__user_agent
+HEADERS = {
+    'Accept-Language': 'ru-RU,ru;q=0.9',
+}
+
+MAX_RETRIES = 5
+
+# Ответы, которыми Avito ограничивает частые запросы
+BLOCKED_STATUSES = (403, 429)
+
+SB_OPTIONS = {
+    'uc': False,
+    'headed': False,
+    'headless': True,
+    'page_load_strategy': 'eager',
+    'block_images': True,
+}
+
+# Ресурсы, не нужные для разбора страниц: стили, шрифты, видео, аналитика
+BLOCKED_URLS = [
+    '*.css',
+    '*.woff*',
+    '*.ttf',
+    '*.mp4',
+    '*.webm',
+    '*googletagmanager*',
+    '*google-analytics*',
+    '*yandex*metrika*',
+    '*mc.yandex*',
+    '*doubleclick*',
+]
+
+# Извлечение полей всех карточек за один вызов: на каждую карточку root
+# возвращается массив значений полей (атрибут или видимый текст)
+_EXTRACT_JS = """
+const sels = arguments[0];
+return Array.from(document.querySelectorAll(sels.root)).map(r =>
+    sels.fields.map(f => {
+        const e = r.querySelector(f.sel);
+        return f.attr ? (e?.[f.attr] ?? e?.getAttribute(f.attr)) : e?.innerText;
+    })
+);
+"""
+
+# Поля карточки объявления: ключ, локатор и атрибут (None — текст)
+LISTING_FIELDS = (
+    ('name', LocatorAvito.NAME, None),
+    ('url', LocatorAvito.URL, 'href'),
+    ('price', LocatorAvito.PRICE, 'content'),
+    ('description', LocatorAvito.DESCRIPTIONS, None),
+)
+
+_LISTING_SELECTORS = {
+    'root': LocatorAvito.TITLES[1],
+    'fields': [
+        {'sel': locator[1], 'attr': attr}
+        for _, locator, attr in LISTING_FIELDS
+    ],
+}
+
+_INITIAL_DATA_JS = """
+return window.__initialData__
+    || document.getElementById('__NEXT_DATA__')?.textContent
+    || null;
+"""
+
+MOSCOW_TZ = ZoneInfo('Europe/Moscow')
+DATE_FORMAT = '%d.%m.%Y %H:%M'
+
+_MONTHS = (
+    'января',
+    'февраля',
+    'марта',
+    'апреля',
+    'мая',
+    'июня',
+    'июля',
+    'августа',
+    'сентября',
+    'октября',
+    'ноября',
+    'декабря',
+)
+_DATE_TEXT_RE = re.compile(
+    r'(?:(сегодня|вчера)|(\d{1,2}) (%s)(?: (\d{4}))?) в (\d{1,2}):(\d{2})'
+    % '|'.join(_MONTHS)
+)
+
+# id объявления — число в конце пути ссылки: ..._7351352202?context=...
+_AD_ID_RE = re.compile(r'_(\d+)(?:\?|$)')
+
+_AREA_RE = re.compile(
+    r'(\d+(?:[.,]\d+)?)\s*(м²|кв\.?м|квадратных метров)', re.IGNORECASE
+)
+# Любое совпадение _AREA_RE содержит одну из этих подстрок (с учётом
+# регистра), поэтому без них регулярку можно не запускать
+_AREA_HINTS = ('м²', 'М²', 'кв', 'Кв', 'кВ', 'КВ')
+
+# Символы, недопустимые в XML 1.0
+_XML_INVALID_RE = re.compile(
+    '[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]'
+)
+
+
+@dataclass(slots=True)
+class Ad:
+    """Объявление: поля, которые сохраняются в XML"""
+
+    name: str
+    url: str
+    price: str
+    area: str
+    date_public: str = ''
+    address: str = ''
+
+
+class BlockedError(Exception):
+    """Avito не отдаёт страницу после всех повторных попыток"""
+
+
+def _backoff(attempt):
+    # Экспоненциальная пауза со случайной добавкой, не больше минуты
+    return min(60, 2**attempt) + random.uniform(0, 2)
+
+
+def _format_time(value):
+    # Дата публикации в одном виде «дд.мм.гггг чч:мм» по Москве. Во
+    # встроенных данных это unix-время в миллисекундах, на детальной
+    # странице — текст вида «· вчера в 17:15» или «· 14 ноября в 22:13»
+    if isinstance(value, (int, float)):
+        moment = datetime.fromtimestamp(value / 1000, MOSCOW_TZ)
+        return moment.strftime(DATE_FORMAT)
+
+    text = str(value).strip(' ·')
+    match = _DATE_TEXT_RE.search(text)
+    if not match:
+        return text
+    relative, day, month, year, hour, minute = match.groups()
+    today = datetime.now(MOSCOW_TZ).date()
+    try:
+        if relative == 'сегодня':
+            date_public = today
+        elif relative == 'вчера':
+            date_public = today - timedelta(days=1)
+        else:
+            date_public = date(
+                int(year) if year else today.year,
+                _MONTHS.index(month) + 1,
+                int(day),
+            )
+            # Год Avito не пишет для текущего года; дата из будущего —
+            # значит, объявление прошлогоднее
+            if not year and date_public > today:
+                date_public = date_public.replace(year=today.year - 1)
+    except ValueError:
+        return text
+    return datetime.combine(
+        date_public, dt_time(int(hour), int(minute))
+    ).strftime(DATE_FORMAT)
+
+
+def _element_text(element):
+    # Как .text в Selenium: вложенные блоки элемента идут отдельными строками
+    return '\n'.join(
+        piece.strip() for piece in element.itertext() if piece.strip()
+    )
+
+
+def _xml_text(value):
+    # lxml не принимает управляющие символы в тексте элементов
+    return _XML_INVALID_RE.sub('', value or '')
+
+
+def _build_ad_element(ad):
+    ad_element = LET.Element('ad')
+    LET.SubElement(ad_element, 'title').text = _xml_text(ad.name)
+    LET.SubElement(ad_element, 'price').text = _xml_text(ad.price)
+    LET.SubElement(ad_element, 'address').text = _xml_text(ad.address)
+    LET.SubElement(ad_element, 'area').text = _xml_text(ad.area)
+    LET.SubElement(ad_element, 'url').text = _xml_text(ad.url)
+    LET.SubElement(ad_element, 'date').text = _xml_text(ad.date_public)
+    return ad_element
 
 
 class AvitoParse:
     """
     Парсинг недвижимости на Avito для ЮФО.
-    Сохранение данных в XML-файлы с именем avito_{region}_{год.месяц.день часы:минуты}.
+    Сохранение данных в XML-файл avito_{region}.xml (один файл на регион).
     Парсинг полей: заголовок, цена, адрес, площадь (м²), ссылка, дата публикации.
     """
 
     def __init__(
-        self, url: str, count: int = 5, stop_event=None, region: str = None
+        self,
+        url: str,
+        count: int = 5,
+        stop_event=None,
+        region: str = None,
+        driver=None,
     ):
         self.base_url = url
         self.url = url
+        self.page = 1
         self.count = count
         self.data = []
+        self.saved = 0
+        self.seen_urls = set()
         self.stop_event = stop_event
         self.region = region
-        self.batch_index = 1
+        self.driver = driver  # Уже запущенный браузер, если передан
+        self.user_agent = None
 
-    def __get_url(self):
-        logger.info(f'Открываю страницу: {self.url}')
+    def __block_resources(self):
         try:
-            self.driver.open(self.url)
-            # Проверяем, не заблокирован ли доступ
-            if 'Доступ ограничен' in self.driver.get_title():
-                logger.info(
-                    'Доступ ограничен: проблема с IP. Пауза перед повторной попыткой.'
-                )
-                time.sleep(
-                    random.randint(10, 20)
-                )  # Оставляем паузу для обхода блокировки
-                return self.__get_url()
-
-            # Ожидаем появления элементов объявлений (или другого ключевого элемента)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(LocatorAvito.TITLES)
+            self.driver.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.driver.execute_cdp_cmd(
+                'Network.setBlockedURLs', {'urls': BLOCKED_URLS}
             )
-            logger.info('Страница успешно загружена.')
+        except Exception as e:
+            logger.debug(f'Не удалось включить блокировку ресурсов: {e}')
 
-        except TimeoutException:
-            logger.error(
-                f'Превышено время ожидания загрузки элементов на странице {self.url}'
-            )
-            time.sleep(5)  # Пауза перед повторной попыткой при таймауте
-            return self.__get_url()
+    def __get_url(self):
+        # Открывает self.url; False — страница без объявлений (конец выдачи)
+        for attempt in range(MAX_RETRIES):
+            logger.info(f'Открываю страницу: {self.url}')
+            try:
+                self.driver.open(self.url)
+                # Проверяем, не заблокирован ли доступ
+                if 'Доступ ограничен' in self.driver.get_title():
+                    logger.info(
+                        'Доступ ограничен: проблема с IP. Пауза перед повторной попыткой.'
+                    )
+                    if attempt < MAX_RETRIES - 1:
+                        # Пауза для обхода блокировки
+                        time.sleep(_backoff(attempt))
+                    continue
+
+                # Несуществующую страницу ?p=N Avito перенаправляет на другую
+                # (с карточками), поэтому проверяем это до ожидания карточек
+                if self.__is_redirected():
+                    logger.info(
+                        f'Страницы {self.url} нет, выдача закончилась.'
+                    )
+                    return False
 
-        except Exception as e:
-            logger.error(f'Ошибка при открытии страницы {self.url}: {e}')
-            time.sleep(5)  # Пауза перед повторной попыткой при других ошибках
-            return self.__get_url()
+                # Ожидаем появления элементов объявлений (или другого ключевого элемента)
+                try:
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located(LocatorAvito.TITLES)
+                    )
+                except TimeoutException:
+                    if not self.__has_no_results():
+                        raise
+                    logger.info(f'На странице {self.url} нет объявлений.')
+                    return False
+                logger.info('Страница успешно загружена.')
+                return True
+
+            except TimeoutException:
+                logger.error(
+                    f'Превышено время ожидания загрузки элементов на странице {self.url}'
+                )
+
+            except Exception as e:
+                logger.error(f'Ошибка при открытии страницы {self.url}: {e}')
+
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(_backoff(attempt))  # Пауза перед повторной попыткой
+        raise BlockedError(
+            f'Страница {self.url} недоступна после {MAX_RETRIES} попыток'
+        )
+
+    def __is_redirected(self):
+        return self.page > 1 and not re.search(
+            rf'[?&]p={self.page}(?:&|$)', self.driver.get_current_url()
+        )
+
+    def __has_no_results(self):
+        # Заглушка Avito «ничего не найдено» вместо списка объявлений
+        return bool(
+            self.driver.execute_script(
+                'return document.querySelectorAll(arguments[0]).length;',
+                LocatorAvito.NO_RESULTS[1],
+            )
+        )
 
     def __paginator(self):
         logger.info('Страница загружена. Просматриваю объявления')
@@ -87,200 +344,322 @@ class AvitoParse:
                 self.driver.execute_script(
                     'window.scrollTo(0, document.body.scrollHeight);'
                 )
-                time.sleep(1)
             except Exception:
                 logger.debug('Не удалось прокрутить страницу, продолжаю.')
+            try:
+                self.__wait_cards_loaded()
+            except TimeoutException:
+                logger.debug('Карточки ещё догружаются, разбираю загруженные.')
             self.__parse_page()
-            time.sleep(random.randint(2, 4))
-            self.open_next_btn()
-        if self.data:  # Сохраняем остатки, если есть
             self.__save_to_xml()
+            if i == self.count - 1:
+                break  # Последняя страница: дальше не переходим
+            time.sleep(random.randint(2, 4))  # Пауза против антибота
+            if not self.open_next_btn():
+                logger.info('Страницы с объявлениями закончились.')
+                break
 
-    def open_next_btn(self):
-        self.url = self.get_next_page_url(self.url)
-        logger.info(f'Переход на следующую страницу: {self.url}')
-        self.driver.open(self.url)
+    def __wait_cards_loaded(self):
+        # После прокрутки карточки догружаются лениво: ждём, пока их число
+        # не перестанет меняться между двумя соседними проверками
+        counts = []
 
-    def get_next_page_url(self, url: str):
-        try:
-            url_parts = urlparse(url)
-            query_params = parse_qs(url_parts.query)
-            current_page = int(query_params.get('p', [1])[0])
-            next_page = current_page + 1
-            next_url = f'{self.base_url}?p={next_page}'
-            return next_url
-        except Exception as err:
-            logger.error(
-                f'Ошибка формирования ссылки на следующую страницу для {url}: {err}'
+        def cards_stable(driver):
+            counts.append(
+                driver.execute_script(
+                    'return document.querySelectorAll(arguments[0]).length;',
+                    LocatorAvito.TITLES[1],
+                )
             )
-            return url
+            return len(counts) > 1 and counts[-1] == counts[-2]
+
+        WebDriverWait(self.driver, 5, poll_frequency=0.5).until(cards_stable)
+
+    def open_next_btn(self):
+        self.page += 1
+        self.url = f'{self.base_url}?p={self.page}'
+        logger.info(f'Переход на следующую страницу: {self.url}')
+        return self.__get_url()
 
     def __parse_page(self):
         if self.stop_event and self.stop_event.is_set():
             logger.info('Процесс остановлен')
             return
-        current_url = (
-            self.driver.get_current_url()
-        )  # Сохраняем текущий URL списка
-        ads_elements = self.driver.find_elements(*LocatorAvito.TITLES)
+        # Все поля объявлений забираем со страницы списка одним вызовом JS
+        keys = [key for key, *_ in LISTING_FIELDS]
+        ads_elements = [
+            dict(zip(keys, values))
+            for values in self.driver.execute_script(
+                _EXTRACT_JS, _LISTING_SELECTORS
+            )
+        ]
         if ads_elements:
             logger.info(f'Найдено объявлений: {len(ads_elements)}')
         else:
             logger.info('Объявления не найдены на странице.')
             return
 
-        for i in range(len(ads_elements)):
-            retries = 3
-            while retries > 0:
-                try:
-                    ads_elements = self.driver.find_elements(
-                        *LocatorAvito.TITLES
-                    )
-                    ad = ads_elements[i]
-                    ad_data = {}
-
-                    ad_data['name'] = ad.find_element(*LocatorAvito.NAME).text
-
-                    description = ''
-                    if ad.find_elements(*LocatorAvito.DESCRIPTIONS):
-                        try:
-                            description = ad.find_element(
-                                *LocatorAvito.DESCRIPTIONS
-                            ).text
-                        except Exception as err:
-                            logger.debug(f'Ошибка получения описания: {err}')
-
-                    ad_data['url'] = ad.find_element(
-                        *LocatorAvito.URL
-                    ).get_attribute('href')
-
-                    price = ad.find_element(*LocatorAvito.PRICE).get_attribute(
-                        'content'
-                    )
-                    ad_data['price'] = price
-                    int(price)  # Проверка, что цена — число
-
-                    # Извлекаем площадь сначала из title, затем из description, если не найдено
-                    area = self.__extract_area(
-                        ad_data['name']
-                    )  # Сначала проверяем title
-                    if (
-                        not area
-                    ):  # Если в title нет площади, проверяем description
-                        area = self.__extract_area(description)
-                    ad_data['area'] = area
-
-                    detail_data = self.__parse_detail(ad_data['url'])
-                    ad_data['date_public'] = detail_data.get('date_public', '')
-                    ad_data['address'] = detail_data.get('address', '')
-
-                    self.data.append(ad_data)
-                    logger.info(
-                        f'Добавлено объявление [{len(self.data)}/2000]'
-                    )
-
-                    if len(self.data) >= 2000:
-                        self.__save_to_xml()
-                        self.data = []  # Очищаем список после сохранения
-                        self.batch_index += 1
-                    else:
-                        self.__save_to_xml()
-
-                    self.driver.open(current_url)
-                    time.sleep(1)  # Даем странице загрузиться
-                    break
-
-                except StaleElementReferenceException as e:
-                    logger.debug(
-                        f'Устаревший элемент, повторная попытка ({retries} осталось): {e}'
-                    )
-                    retries -= 1
-                    time.sleep(1)
-                except Exception as e:
-                    logger.debug(f'Не удалось обработать объявление: {e}')
-                    break
+        ads = []
+        for item in ads_elements:
+            try:
+                name = item['name']
+                url = item['url']
+                # Одно объявление может встретиться на нескольких страницах
+                # (продвижение, переранжирование), детали грузим один раз
+                ad_key = url.split('?', 1)[0]
+                if ad_key in self.seen_urls:
+                    continue
+
+                price = item['price']
+                if not price or not price.isdigit():
+                    logger.debug(f'Цена не число, пропускаю: {url}')
+                    continue
+
+                # Извлекаем площадь сначала из title, затем из description, если не найдено
+                area = self.__extract_area(name)
+                if not area:
+                    area = self.__extract_area(item['description'] or '')
+
+                self.seen_urls.add(ad_key)
+                ads.append(Ad(name=name, url=url, price=price, area=area))
+            except Exception as e:
+                logger.debug(f'Не удалось обработать объявление: {e}')
+
+        # Адрес и дату берём из данных, встроенных в страницу списка;
+        # детальные страницы грузим только для объявлений без них
+        initial_data = self.__initial_data()
+        pending = []
+        for ad_data in ads:
+            match = _AD_ID_RE.search(ad_data.url)
+            entry = initial_data.get(match.group(1), {}) if match else {}
+            if entry.get('locationName') and entry.get('time'):
+                ad_data.address = entry['locationName']
+                ad_data.date_public = _format_time(entry['time'])
+            else:
+                pending.append(ad_data)
+
+        # Детальные страницы загружаем параллельно обычными HTTP-запросами
+        blocked = None
+        if pending:
+            details = asyncio.run(
+                self.__fetch_details(
+                    [ad.url for ad in pending],
+                    self.__cookies_from_driver(),
+                )
+            )
+            for ad_data, detail_data in zip(pending, details):
+                if isinstance(detail_data, BaseException):
+                    blocked = detail_data
+                    continue
+                ad_data.date_public = detail_data.get('date_public', '')
+                ad_data.address = detail_data.get('address', '')
+
+        for ad_data in ads:
+            self.data.append(ad_data)
+            logger.info(
+                f'Добавлено объявление [{self.saved + len(self.data)}]'
+            )
+        # Объявления страницы уже в self.data, теперь можно прервать регион
+        if blocked:
+            raise blocked
 
-    def __extract_area(self, text):
-        pattern = r'(\d+(?:[.,]\d+)?)\s*(м²|кв\.?м|квадратных метров)'
-        match = re.search(pattern, text, re.IGNORECASE)
+    def __initial_data(self):
+        # Avito встраивает данные каталога в страницу (иногда URL-кодированный
+        # JSON); собираем из них объявления по id
+        try:
+            raw = self.driver.execute_script(_INITIAL_DATA_JS)
+            if isinstance(raw, str):
+                raw = json.loads(unquote(raw))
+        except Exception as e:
+            logger.debug(f'Не удалось разобрать данные страницы: {e}')
+            return {}
+
+        items = {}
+        stack = [raw]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if 'id' in node and ('locationName' in node or 'time' in node):
+                    items[str(node['id'])] = node
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+        return items
+
+    @staticmethod
+    def __extract_area(text):
+        if not any(hint in text for hint in _AREA_HINTS):
+            return ''
+        match = _AREA_RE.search(text)
         if match:
             return match.group(1)
         return ''
 
-    def __parse_detail(self, url):
-        detail_data = {}
+    def __cookies_from_driver(self):
+        # Куки браузера (в т.ч. антибот-токены) берём заново на каждой
+        # странице списка, чтобы HTTP-запросы шли с актуальной сессией
         try:
-            self.driver.open(url)
-            time.sleep(2)
-            if 'Доступ ограничен' in self.driver.get_title():
-                logger.info('Доступ ограничен на детальной странице. Пауза.')
-                time.sleep(random.randint(10, 20))
-                return self.__parse_detail(url)
-            date_elements = self.driver.find_elements(
-                *LocatorAvito.DATE_PUBLIC
-            )
-            if date_elements:
-                detail_data['date_public'] = date_elements[0].text
-            else:
-                detail_data['date_public'] = ''
-            geo_elements = self.driver.find_elements(*LocatorAvito.GEO)
-            if geo_elements:
-                detail_data['address'] = geo_elements[0].text
-            else:
-                detail_data['address'] = ''
+            return {
+                cookie['name']: cookie['value']
+                for cookie in self.driver.driver.get_cookies()
+            }
         except Exception as e:
-            logger.debug(f'Ошибка при парсинге детали объявления {url}: {e}')
-            detail_data['date_public'] = ''
-            detail_data['address'] = ''
-        return detail_data
+            logger.debug(f'Не удалось получить куки браузера: {e}')
+            return {}
 
-    def __save_to_xml(self):
-        if not self.data:
-            logger.info('Нет данных для сохранения.')
-            return
+    def __user_agent(self):
+        # Антибот-токены в куках привязаны к User-Agent браузера, поэтому
+        # HTTP-запросы должны представляться тем же браузером
+        try:
+            return self.driver.execute_script('return navigator.userAgent;')
+        except Exception as e:
+            logger.debug(f'Не удалось получить User-Agent браузера: {e}')
+            return None
+
+    async def __fetch_details(self, urls, cookies):
+        semaphore = asyncio.Semaphore(10)
+        connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=(
+                {**HEADERS, 'User-Agent': self.user_agent}
+                if self.user_agent
+                else HEADERS
+            ),
+            cookies=cookies,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as session:
+            return await asyncio.gather(
+                *(
+                    self.__parse_detail(session, semaphore, url)
+                    for url in urls
+                ),
+                return_exceptions=True,
+            )
 
-        root = ET.Element('real_estate')
-        for ad in self.data:
-            ad_element = ET.SubElement(root, 'ad')
-            ET.SubElement(ad_element, 'title').text = ad.get('name', '')
-            ET.SubElement(ad_element, 'price').text = ad.get('price', '')
-            ET.SubElement(ad_element, 'address').text = ad.get('address', '')
-            ET.SubElement(ad_element, 'area').text = ad.get('area', '')
-            ET.SubElement(ad_element, 'url').text = ad.get('url', '')
-            ET.SubElement(ad_element, 'date').text = ad.get('date_public', '')
-
-        # Форматирование XML с отступами
-        xml_str = ET.tostring(root, encoding='utf-8')
-        xml_pretty = minidom.parseString(xml_str).toprettyxml(
-            indent='  ', encoding='utf-8'
+    async def __parse_detail(self, session, semaphore, url):
+        detail_data = {'date_public': '', 'address': ''}
+        blocked = False
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with semaphore:
+                    async with session.get(url) as response:
+                        blocked = response.status in BLOCKED_STATUSES
+                        if not blocked:
+                            # Прочие 4xx/5xx — ошибка, страницу не разбираем
+                            response.raise_for_status()
+                            text = await response.text()
+                if not blocked:
+                    tree = lxml.html.fromstring(text)
+                    blocked = 'Доступ ограничен' in (
+                        tree.findtext('.//title') or ''
+                    )
+                if blocked:
+                    logger.info(
+                        'Доступ ограничен на детальной странице. Пауза.'
+                    )
+                else:
+                    date_elements = _DATE_PUBLIC_SELECTOR(tree)
+                    detail_data['date_public'] = (
+                        _format_time(date_elements[0].text_content())
+                        if date_elements
+                        else ''
+                    )
+                    geo_elements = _GEO_SELECTOR(tree)
+                    detail_data['address'] = (
+                        _element_text(geo_elements[0]) if geo_elements else ''
+                    )
+                    return detail_data
+            except Exception as e:
+                # Таймауты и обрывы соединения повторяем так же, как блокировку
+                blocked = False
+                logger.debug(
+                    f'Ошибка при загрузке детали объявления {url}: {e}'
+                )
+            if attempt < MAX_RETRIES - 1:
+                await asyncio.sleep(_backoff(attempt))
+        if blocked:
+            raise BlockedError(f'Доступ ограничен на детальной странице {url}')
+        logger.error(
+            f'Не удалось загрузить детали объявления {url} '
+            f'после {MAX_RETRIES} попыток'
         )
+        return detail_data
 
-        file_name = f'avito_{self.region}_part{self.batch_index}.xml'
-        with open(file_name, 'wb') as f:
-            f.write(xml_pretty)
-
-        logger.info(
-            f'Сохранён файл {file_name} с {len(self.data)} объявлениями.'
-        )
+    def __save_to_xml(self):
+        # Объявления страницы дописываются в открытый файл и сразу
+        # сбрасываются на диск, чтобы при падении не терять собранное
+        try:
+            for ad in self.data:
+                ad_element = _build_ad_element(ad)
+                LET.indent(ad_element, space='  ', level=1)
+                self.xml_file.write('\n  ', ad_element, with_tail=False)
+                self.saved += 1
+            self.xml_file.flush()
+        finally:
+            # Очищаем и при ошибке, чтобы не записать объявления повторно
+            self.data = []
 
     def parse(self):
-        with SB(
-            uc=False,
-            headed=False,
-            headless=True,
-            page_load_strategy='eager',
-            block_images=True,
-        ) as self.driver:
-            try:
-                self.__get_url()
-                self.__paginator()
-            except Exception as err:
-                logger.error(f'Ошибка в процессе парсинга: {err}')
-                if self.data:
-                    self.__save_to_xml()
+        file_name = f'avito_{self.region}.xml'
+        browser = nullcontext(self.driver) if self.driver else SB(**SB_OPTIONS)
+        with LET.xmlfile(
+            file_name, encoding='utf-8'
+        ) as self.xml_file, browser as self.driver:
+            self.xml_file.write_declaration()
+            self.__block_resources()
+            self.user_agent = self.__user_agent()
+            with self.xml_file.element('real_estate'):
+                try:
+                    if self.__get_url():
+                        self.__paginator()
+                except BlockedError as err:
+                    logger.error(f'Регион {self.region} пропущен: {err}')
+                except Exception as err:
+                    logger.error(f'Ошибка в процессе парсинга: {err}')
+                finally:
+                    self.__save_to_xml()  # Сохраняем остатки, если есть
+                    self.xml_file.write('\n')
+        logger.info(f'Сохранён файл {file_name} с {self.saved} объявлениями.')
         logger.info('Парсинг завершен.')
 
 
+def _run_region(region, driver=None):
+    base_url = f'https://www.avito.ru/{region}/kvartiry/prodam'
+    logger.info(f'Начинаю парсинг региона: {region}')
+    avito_parser = AvitoParse(
+        url=base_url,
+        count=35,  # Количество страниц для парсинга на регион
+        region=region,  # Передаем регион
+        driver=driver,
+    )
+    avito_parser.parse()
+
+
+def _run_regions(regions):
+    # Один браузер на процесс: запуск Chromium дорогой, переиспользуем его.
+    # Если браузер упал, следующие регионы парсим в новом
+    pending = list(regions)
+    while pending:
+        with SB(**SB_OPTIONS) as driver:
+            while pending:
+                region = pending.pop(0)
+                try:
+                    _run_region(region, driver)
+                except Exception as err:
+                    logger.error(f'Ошибка парсинга региона {region}: {err}')
+                try:
+                    # Сброс состояния заодно проверяет, что браузер жив
+                    driver.delete_all_cookies()
+                    driver.open('about:blank')
+                except WebDriverException as err:
+                    logger.error(
+                        f'Браузер недоступен после региона {region}: {err}. '
+                        'Перезапускаю.'
+                    )
+                    break
+
+
 if __name__ == '__main__':
     UFO_REGIONS = [
         'krasnodarskiy_kray',
@@ -292,12 +671,13 @@ if __name__ == '__main__':
         'respublika_krym',
         'sevastopol',
     ]
-    for region in UFO_REGIONS:
-        base_url = f'https://www.avito.ru/{region}/kvartiry/prodam'
-        logger.info(f'Начинаю парсинг региона: {region}')
-        avito_parser = AvitoParse(
-            url=base_url,
-            count=35,  # Количество страниц для парсинга на регион
-            region=region,  # Передаем регион
+    # Регионы независимы, парсим их параллельно в отдельных процессах.
+    # Число процессов ограничено, чтобы не упереться в лимиты Avito по IP.
+    workers = min(4, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        list(
+            ex.map(
+                _run_regions,
+                [UFO_REGIONS[i::workers] for i in range(workers)],
+            )
         )
-        avito_parser.parse()